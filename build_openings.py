@@ -0,0 +1,58 @@
+import sys
+import time
+from src.board import Board
+from src.openings import MAX_BOOK_SIZE, OpeningBook, canonical_position
+
+# Сколько полуходов от начала партии покрывает книга для каждого размера поля
+PLIES = {3: 9, 4: 5, 5: 5, 6: 3}
+# Зерно ГСЧ для поиска, чтобы книга собиралась одинаково
+SEED = 0
+
+
+def build(size: int, plies: int) -> dict[int, int]:
+    entries: dict[int, int] = {}
+
+    # rows - позиция, где ходит игрок; перебираем все его ответы
+    def expand(rows: list[str], stones: int) -> None:
+        for i in range(size):
+            for j in range(size):
+                if rows[i][j] != '.':
+                    continue
+                child = Board.place(rows, i, j, 'X')
+                board = Board.from_rows(child, rng=SEED, use_book=False)
+                if board.detect_wins_or_draws() is not None:
+                    continue
+                key, transform = canonical_position(board.get())
+                if key in entries:
+                    continue
+                move = board.hard_diff_move().to_tuple()
+                ti, tj = transform(*move)
+                entries[key] = ti * size + tj
+                if stones + 2 < plies:
+                    reply = Board.place(child, move[0], move[1], 'O')
+                    if Board.from_rows(reply, rng=SEED, use_book=False).detect_wins_or_draws() is None:
+                        expand(reply, stones + 2)
+
+    expand(['.' * size] * size, 0)
+    return entries
+
+
+def main() -> int:
+    sizes = list(map(int, sys.argv[1:])) or list(PLIES)
+    unsupported = [size for size in sizes if size > MAX_BOOK_SIZE or size not in PLIES]
+    if len(unsupported) != 0:
+        for size in unsupported:
+            print(f"{size}x{size}: no opening book for this size.")
+        return 1
+    for size in sizes:
+        start = time.perf_counter()
+        entries = build(size, PLIES[size])
+        win_length = Board.get_win_condition(size)
+        OpeningBook(size, entries).save(win_length)
+        print(f"{size}x{size}: {len(entries)} positions, {time.perf_counter() - start:.1f} s "
+              f"-> {OpeningBook.path(size, win_length).name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
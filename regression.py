@@ -0,0 +1,77 @@
+import sys
+import time
+from src.board import Board
+from src.openings import OpeningBook, canonical_position
+
+# Зерно ГСЧ, с которым сняты эталонные ходы
+SEED = 0
+# Общее время на все позиции, секунды: сейчас около 0.05, запас десятикратный
+TIME_BUDGET = 0.5
+
+# Эталонные позиции: поле (ход за ИИ, "." - пусто), ожидаемый ход "сложного"
+# ИИ и бюджет проверенных им линий. Если ход изменился, линий проверено больше
+# бюджета или все позиции вместе считались дольше TIME_BUDGET - проверка
+# падает. Книга дебютов отключена: проверяется сам поиск. Отдельно сверяем
+# ответы книги с поиском, чтобы не пропустить устаревшую книгу.
+# После осознанных изменений движка бюджеты обновляются вручную, а книги
+# пересобираются через build_openings.py.
+GOLDEN: list[tuple[list[str], tuple[int, int], int]] = [
+    (['X..', '...', '...'], (1, 1), 115),
+    (['...', '.X.', '...'], (2, 2), 200),
+    (['XOX', '..X', '..O'], (1, 1), 119),
+    (['X..', '..X', 'OXO'], (1, 1), 137),
+    (['X...', '....', '....', '....'], (1, 1), 339),
+    (['....', '.X..', '..O.', '...X'], (2, 1), 739),
+    (['O...', '.XXO', '.X..', '..OX'], (2, 2), 336),
+    (['O.X.', 'X...', '..X.', '..O.'], (1, 2), 96),
+    (['.....', '.....', '..X..', '.....', '.....'], (3, 2), 856),
+    (['X....', '.....', '..O..', '.....', '...X.'], (3, 1), 1088),
+    (['.X.OO', '....X', '...O.', '.X.X.', 'O..X.'], (3, 2), 432),
+    (['.X.X.', 'O....', '...O.', 'X.O..', '....X'], (2, 1), 511),
+    (['......', '......', '..X...', '......', '......', '......'], (3, 2), 1230),
+    (['.....X', '..O...', '.O....', 'X.....', '.OX...', '..X...'], (3, 2), 774),
+    (['....O.', '..X...', '...X.O', '......', 'X.....', '......'], (3, 4), 870),
+]
+
+
+def check(rows: list[str], expected: tuple[int, int], budget: int) -> tuple[bool, float]:
+    board = Board.from_rows(rows, rng=SEED, use_book=False)
+    start = time.perf_counter()
+    move = board.hard_diff_move().to_tuple()
+    elapsed = time.perf_counter() - start
+    lines = board.evaluated_lines()
+    passed = move == expected and lines <= budget
+    print(f"{'ok  ' if passed else 'FAIL'} {'/'.join(rows)}: move {move} (expected {expected}), "
+          f"lines {lines}/{budget}, {elapsed * 1000:.1f} ms")
+    return passed, elapsed
+
+
+# Книга хранит позиции с точностью до поворотов и отражений, поэтому её ход
+# сравниваем с эталонным по канонической позиции после хода
+def check_book(rows: list[str], expected: tuple[int, int]) -> bool | None:
+    board = Board.from_rows(rows)
+    move = OpeningBook.load(board.size(), Board.get_win_condition(board.size())).lookup(board.get())
+    if move is None:
+        return None
+    after_book = canonical_position(Board.from_rows(Board.place(rows, *move.to_tuple(), 'O')).get())[0]
+    after_search = canonical_position(Board.from_rows(Board.place(rows, *expected, 'O')).get())[0]
+    passed = after_book == after_search
+    print(f"{'ok  ' if passed else 'FAIL'} {'/'.join(rows)}: book move {move.to_tuple()} "
+          f"{'matches' if passed else 'differs from'} search move {expected}")
+    return passed
+
+
+def main() -> int:
+    timed = [check(*position) for position in GOLDEN]
+    results = [passed for passed, _ in timed]
+    elapsed = sum(seconds for _, seconds in timed)
+    results.append(elapsed <= TIME_BUDGET)
+    print(f"{'ok  ' if results[-1] else 'FAIL'} total search time {elapsed * 1000:.1f}/{TIME_BUDGET * 1000:.0f} ms")
+    print()
+    results += [result for rows, move, _ in GOLDEN if (result := check_book(rows, move)) is not None]
+    print(f"\n{results.count(True)}/{len(results)} golden checks passed.")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
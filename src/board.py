@@ -1,5 +1,6 @@
 from typing import Self, TypeVar
 from .cells import CellRef, CellState, CellWeightMap
+from .openings import OpeningBook
 from enum import StrEnum
 import random
 import copy
@@ -24,6 +25,9 @@ class Board(object):
     __grid: list[list[CellState]]
     __map: list[list[CellRef]]
     __cpu_side: CellState
+    __rng: random.Random
+    __lines: list[int]
+    __use_book: bool
 
     def size(self: Self) -> int:
         return len(self.__grid)
@@ -52,6 +56,7 @@ class Board(object):
         return result
 
     def __ref2state(self: Self, row: list[CellRef]) -> list[CellState]:
+        self.__lines[0] += 1
         return list(map(CellRef.get_lambda(self.__grid), row))
 
     def __can_complete_line(self: Self, row: list[CellRef], side: CellState) -> bool:
@@ -92,7 +97,7 @@ class Board(object):
 # /////////////////////////////////////////
 
 
-    def __init__(self: Self, size: int) -> None:
+    def __init__(self: Self, size: int, rng: random.Random | int | None = None, use_book: bool = True) -> None:
         if size < 3:
             raise BoardException("Size must be 3 or larger.")
         win_condition = Board.get_win_condition(size)
@@ -101,6 +106,15 @@ class Board(object):
         global __weight_map
         __weight_map = CellWeightMap(size, win_condition)
         self.__cpu_side = CellState.O
+        self.__rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+        self.__lines = [0]  # счётчик общий с копиями-симуляциями
+        self.__use_book = use_book
+
+    # Копия для симуляции: общие карта линий и ГСЧ, своё только поле
+    def __deepcopy__(self: Self, memo: dict[int, object]) -> Self:
+        board = copy.copy(self)
+        board.__grid = [row[:] for row in self.__grid]
+        return board
 
     def __str__(self: Self) -> str:
         result: list[str] = []
@@ -167,18 +181,18 @@ class Board(object):
     def __random_move(self: Self, movelist: list[CellRef] = []) -> CellRef:
         if len(movelist) == 0:
             movelist = self.__get_all_legal_moves()
-        return random.choice(movelist)
+        return self.__rng.choice(movelist)
 
     # Рандомный из самых выгодных
     def __best_value_move(self: Self, movelist: list[CellRef] = []) -> CellRef:
         if len(movelist) == 0:
             movelist = self.__get_all_legal_moves()
         weights = list(map(self.__get_weight, movelist))
-        return random.choice([movelist[k] for k in [i for i, val in enumerate(weights) if val == max(weights)]])
+        return self.__rng.choice([movelist[k] for k in [i for i, val in enumerate(weights) if val == max(weights)]])
 
     # Что-то среднее
     def __hesitant_move(self: Self, movelist: list[CellRef] = []) -> CellRef:
-        return random.choice([self.__random_move, self.__best_value_move])(movelist)
+        return self.__rng.choice([self.__random_move, self.__best_value_move])(movelist)
 
 
 # /////////////////////////////////////////
@@ -207,10 +221,10 @@ class Board(object):
         if pov == CellState.EMPTY:
             pov = self.__cpu_side
         wins = self.__dw_internal(pov)
-        if (random.choice([True, False]) if go_easy else True) and (len(wins) != 0):
+        if (self.__rng.choice([True, False]) if go_easy else True) and (len(wins) != 0):
             return wins
         decisions = self.__block_or_push(pov)
-        if (random.choice([True, False]) if go_easy else True) :
+        if (self.__rng.choice([True, False]) if go_easy else True) :
             return decisions
         return []
 
@@ -219,61 +233,24 @@ class Board(object):
         board.__make_a_move(move, side)
         return board
 
-    def __calculate_ahead(self: Self, turns: int, board: Self | None = None, pov: CellState = CellState.EMPTY) -> dict[CellRef, tuple[object | CellState, CellState] | None] | None:
-        if pov == CellState.EMPTY:
-            pov = self.__cpu_side
-        if turns <= 0:
-            return None
-        if board is None:
-            board = copy.deepcopy(self)
-        moveset = board.__pick_best_moves(pov)
-        result: dict[CellRef, tuple[object | CellState, CellState] | None] = {}
-        for move in moveset:
-            outcome = board.__simulate_move(pov, move)
+    # В оценку хода идёт только первый полуход: глубже старый просчёт строил
+    # дерево, которое при подсчёте всё равно не учитывалось
+    def __score_moves(self: Self, pov: CellState) -> dict[CellRef, dict[str, int]]:
+        result: dict[CellRef, dict[str, int]] = {}
+        for move in dict.fromkeys(self.__pick_best_moves(pov)):
+            wins = 0
+            value = self.__get_weight(move) if pov == self.__cpu_side else 0
+            outcome = self.__simulate_move(pov, move)
             has_anyone_won = outcome.__cfw_internal()
             if has_anyone_won != CellState.EMPTY:
-                result[move] = (has_anyone_won, pov)
+                wins += 1 if has_anyone_won == self.__cpu_side else -1
             elif outcome.is_full():
-                result[move] = (self.__cpu_side.opposite(), pov)
-            else:
-                result[move] = ((
-                    self.__get_weight(move),
-                    self.__calculate_ahead(turns - 1, outcome, pov.opposite())
-                ), pov)
-        return result
-
-    def __assess_predictions(self: Self, predictions: dict[CellRef, tuple[object | CellState, CellState] | None] | None) -> dict[CellRef, dict[str, int]] | None:
-        if predictions is None:
-            return None
-        result: dict[CellRef, dict[str, int]] = {}
-        for move in predictions:
-            if predictions[move] is None:
-                continue
-            data = predictions[move]
-            prediction = data[0] # type: ignore
-            side = data[1]       # type: ignore
-            if move not in result:
-                result[move] = {
-                    "wins": 0,
-                    "total_value": self.__get_weight(move) if side == self.__cpu_side else 0
-                }
-            if isinstance(prediction, CellState):
-                if prediction == self.__cpu_side:
-                    result[move]["wins"] += 1
-                else:
-                    result[move]["wins"] -= 1
-            if isinstance(prediction, dict):
-                look_forward = self.__assess_predictions(prediction) # type: ignore
-                if look_forward is not None:
-                    for move2 in look_forward:
-                        result[move]["wins"] += look_forward[move2]["wins"]
-                        result[move]["total_value"] += look_forward[move2]["total_value"]
+                wins -= 1
+            result[move] = {"wins": wins, "total_value": value}
         return result
 
-    def __gigabrain(self: Self, turns: int) -> list[CellRef]:
-        simulation_results = self.__assess_predictions(self.__calculate_ahead(turns))
-        if simulation_results is None:
-            return []
+    def __gigabrain(self: Self) -> list[CellRef]:
+        simulation_results = self.__score_moves(self.__cpu_side)
         best_moves: list[tuple[CellRef, int, int]] = []
         for move in simulation_results:
             raw = simulation_results[move]
@@ -338,23 +315,44 @@ class Board(object):
         return self.__hesitant_move(self.__pick_best_moves(go_easy=True))
 
     def hard_diff_move(self: Self) -> CellRef:
-        depth = 3
-        size = self.size()
-        if size == 3:  # match case юзать опасно, оно только в 3.10 появилось
-            depth = 8  # хрен знает, на какой древней версии это запустят
-        if size == 4:
-            depth = 5
-        if size == 5:
-            depth = 4
-        return self.__best_value_move(self.__gigabrain(depth))
+        self.__lines[0] = 0
+        if self.__use_book:
+            move = OpeningBook.load(self.size(), Board.get_win_condition(self.size())).lookup(self.__grid)
+            if move is not None and move.get(self.__grid) == CellState.EMPTY:
+                return move
+        return self.__best_value_move(self.__gigabrain())
 
     def cpu_move(self: Self, diff: Diff) -> bool:
         if diff == Diff.EASY:
             move = self.easy_diff_move()
-        if diff == Diff.HARD:
+        elif diff == Diff.HARD:
             move = self.hard_diff_move()
-        move = self.med_diff_move()
+        else:
+            move = self.med_diff_move()
         return self.__make_a_move(move, self.__cpu_side)
 
     def get(self: Self) -> list[list[CellState]]:
         return self.__grid
+
+    # Сколько линий проверил последний ход "сложного" ИИ - мера его работы
+    def evaluated_lines(self: Self) -> int:
+        return self.__lines[0]
+
+    # Поле из строк вида "X.O", где "." - пустая клетка
+    @classmethod
+    def from_rows(cls: type[Self], rows: list[str], rng: random.Random | int | None = None, use_book: bool = True) -> Self:
+        board = cls(len(rows), rng, use_book)
+        for i, row in enumerate(rows):
+            if len(row) != len(rows):
+                raise BoardException("Board must be square.")
+            for j, char in enumerate(row):
+                if char not in ".XO":
+                    raise BoardException("Cells must be '.', 'X' or 'O'.")
+                if char != '.':
+                    board.__make_a_move(CellRef(i, j), CellState(char))
+        return board
+
+    # Те же строки поля, но с символом side в клетке (i, j)
+    @staticmethod
+    def place(rows: list[str], i: int, j: int, side: str) -> list[str]:
+        return rows[:i] + [rows[i][:j] + side + rows[i][j+1:]] + rows[i+1:]
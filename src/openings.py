@@ -0,0 +1,108 @@
+from typing import Self
+from collections.abc import Callable
+from array import array
+from pathlib import Path
+from .cells import CellRef, CellState
+import bisect
+import struct
+
+_BOOKS_DIR = Path(__file__).parent / "books"
+# Запись книги: ключ канонической позиции и номер клетки с ответом ИИ
+_RECORD = struct.Struct("<QB")
+# Позиция кодируется в троичной системе, в 64 бита влезает поле до 6x6
+MAX_BOOK_SIZE = 6
+
+_DIGITS = {CellState.EMPTY: 0, CellState.X: 1, CellState.O: 2}
+
+
+def _symmetries(size: int) -> list[Callable[[int, int], tuple[int, int]]]:
+    n = size - 1
+    return [
+        lambda i, j: (i, j),
+        lambda i, j: (j, n - i),
+        lambda i, j: (n - i, n - j),
+        lambda i, j: (n - j, i),
+        lambda i, j: (i, n - j),
+        lambda i, j: (n - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (n - j, n - i),
+    ]
+
+
+# Номер обратного преобразования для каждого из _symmetries: повороты на 90
+# и 270 градусов обращают друг друга, остальные обращают сами себя
+_INVERSES = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def _canonical_index(grid: list[list[CellState]]) -> tuple[int, int]:
+    size = len(grid)
+    best: tuple[int, int] | None = None
+    for index, transform in enumerate(_symmetries(size)):
+        image = [[CellState.EMPTY for _ in range(size)] for _ in range(size)]
+        for i in range(size):
+            for j in range(size):
+                ti, tj = transform(i, j)
+                image[ti][tj] = grid[i][j]
+        key = 0
+        for row in image:
+            for cell in row:
+                key = key * 3 + _DIGITS[cell]
+        if best is None or key < best[0]:
+            best = (key, index)
+    return best # type: ignore
+
+
+def canonical_position(grid: list[list[CellState]]) -> tuple[int, Callable[[int, int], tuple[int, int]]]:
+    key, index = _canonical_index(grid)
+    return key, _symmetries(len(grid))[index]
+
+
+class OpeningBook(object):
+    __keys: array
+    __moves: bytes
+    __size: int
+    __cache: dict[tuple[int, int], "OpeningBook"] = {}
+
+    def __init__(self: Self, size: int, entries: dict[int, int] | None = None) -> None:
+        self.__size = size
+        self.__keys = array('Q')
+        self.__moves = b''
+        if entries is not None:
+            ordered = sorted(entries.items())
+            self.__keys = array('Q', [key for key, _ in ordered])
+            self.__moves = bytes(move for _, move in ordered)
+
+    def __len__(self: Self) -> int:
+        return len(self.__keys)
+
+    @staticmethod
+    def path(size: int, win_length: int) -> Path:
+        return _BOOKS_DIR / f"{size}x{size}_{win_length}.book"
+
+    @classmethod
+    def load(cls: type[Self], size: int, win_length: int) -> Self:
+        if (size, win_length) not in cls.__cache:
+            entries: dict[int, int] = {}
+            path = cls.path(size, win_length)
+            if size <= MAX_BOOK_SIZE and path.exists():
+                for key, move in _RECORD.iter_unpack(path.read_bytes()):
+                    entries[key] = move
+            cls.__cache[(size, win_length)] = cls(size, entries)
+        return cls.__cache[(size, win_length)] # type: ignore
+
+    def save(self: Self, win_length: int) -> None:
+        path = OpeningBook.path(self.__size, win_length)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b''.join(_RECORD.pack(key, move) for key, move in zip(self.__keys, self.__moves)))
+
+    def lookup(self: Self, grid: list[list[CellState]]) -> CellRef | None:
+        if len(self.__keys) == 0 or len(grid) != self.__size:
+            return None
+        key, symmetry = _canonical_index(grid)
+        index = bisect.bisect_left(self.__keys, key)
+        if index == len(self.__keys) or self.__keys[index] != key:
+            return None
+        move = self.__moves[index]
+        # Ход хранится для канонической позиции, возвращаем его на исходное поле
+        i, j = _symmetries(self.__size)[_INVERSES[symmetry]](move // self.__size, move % self.__size)
+        return CellRef(i, j)